@@ -1,12 +1,18 @@
 """Define the configuration of the main program."""
 
+import os
+import stat
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from maison.config import ProjectConfig
+from maison.utils import get_file_path
 
 from yamlfix.model import YamlfixConfig
 
+_CONFIG_FIELDS = frozenset(YamlfixConfig.__fields__)
+
 
 def configure_yamlfix(
     yamlfix_config: YamlfixConfig,
@@ -22,21 +28,82 @@ def configure_yamlfix(
         if config_path_env:
             config_path = Path(config_path_env)
 
+    config_dict = _load_config_dict(
+        tuple(config_files or []),
+        config_path,
+        # Keys that aren't configuration fields would be dropped by the validation,
+        # leaving them out of the cache key avoids needless cache misses
+        tuple(
+            (key, value)
+            for key, value in (additional_config or {}).items()
+            if key in _CONFIG_FIELDS
+        ),
+        _config_files_state(config_files, config_path),
+    )
+
+    for config_key, config_val in config_dict.items():
+        setattr(yamlfix_config, config_key, config_val)
+
+
+FileState = Tuple[str, int, int, int]
+
+
+def _config_files_state(
+    config_files: Optional[List[str]], config_path: Optional[Path]
+) -> Tuple[FileState, ...]:
+    """Find the configuration files like maison does, with their stat signature.
+
+    The inode and size are used along the modification time, as edits made within
+    the same mtime tick keep it unchanged.
+    """
+    state = []
+    for config_file in config_files or ["pyproject.toml"]:
+        # Absolute paths, as given with --config-file, are used as they are, a single
+        # stat tells whether they exist and when they were modified
+        expanded_file = os.path.expanduser(config_file)
+        if os.path.isabs(expanded_file):
+            try:
+                file_stat = os.stat(expanded_file)
+            except OSError:
+                file_stat = None
+            if file_stat and stat.S_ISREG(file_stat.st_mode):
+                state.append(_file_state(expanded_file, file_stat))
+                continue
+
+        file_path = get_file_path(filename=config_file, starting_path=config_path)
+        if file_path:
+            state.append(_file_state(str(file_path), file_path.stat()))
+    return tuple(state)
+
+
+def _file_state(file_path: str, file_stat: os.stat_result) -> FileState:
+    return (file_path, file_stat.st_ino, file_stat.st_size, file_stat.st_mtime_ns)
+
+
+@lru_cache(maxsize=8)
+def _load_config_dict(
+    config_files: Tuple[str, ...],
+    config_path: Optional[Path],
+    additional_config: Tuple[Tuple[str, str], ...],
+    config_files_state: Tuple[FileState, ...],  # pylint: disable=unused-argument
+) -> Dict[str, Any]:
+    """Parse and validate the configuration.
+
+    The result is cached, `config_files_state` is only part of the cache key so that
+    moved or edited configuration files are parsed again.
+    """
     config: ProjectConfig = ProjectConfig(
         config_schema=YamlfixConfig,
         merge_configs=True,
         project_name="yamlfix",
-        source_files=config_files,
+        source_files=list(config_files) or None,
         starting_path=config_path,
     )
+    # to_dict returns the dictionary that validate checks, so the overrides are
+    # validated together with the values read from the files
     config_dict: Dict[str, Any] = config.to_dict()
 
-    if additional_config:
-        for override_key, override_val in additional_config.items():
-            config_dict[override_key] = override_val
-
-    config.validate()
-    config_dict = config.to_dict()
+    for override_key, override_val in additional_config:
+        config_dict[override_key] = override_val
 
-    for config_key, config_val in config_dict.items():
-        setattr(yamlfix_config, config_key, config_val)
+    return config.validate()
@@ -2,9 +2,11 @@
 
 import logging
 import os
+import re
 import sys
-from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
 
 import click
 from _io import TextIOWrapper
@@ -16,26 +18,332 @@ from yamlfix.model import YamlfixConfig
 
 log = logging.getLogger(__name__)
 
+GlobMatcher = Callable[[str], Any]
 
-def _matches_any_glob(
-    file_to_test: Path, dir_: Path, globs: Optional[List[str]]
-) -> bool:
-    return any(file_to_test in dir_.glob(glob) for glob in (globs or []) if glob)
+# Number of threads scanning directories at the same time
+WALK_WORKERS = 8
 
-def _find_all_yaml_files(
-    dir_: Path, include_globs: Optional[List[str]], exclude_globs: Optional[List[str]]
-) -> List[Path]:
-    include_files = []
-    for include_glob in (include_globs or []):
-        if include_glob:
-            include_files.extend(dir_.rglob(include_glob))
-    return [
-        file
-        for file in include_files
-        if not _matches_any_glob(file, dir_, exclude_globs) and os.path.isfile(file)
+
+def _normalize_glob(glob: str) -> str:
+    """Drop the `.` and empty components of a glob, as pathlib does.
+
+    A trailing slash is kept, as it marks a glob that only matches directories.
+    Absolute globs are rejected, as globs are relative to the fixed directory.
+    """
+    if glob.startswith("/"):
+        raise ValueError(f"Non-relative glob '{glob}' is not supported.")
+    components = [
+        component for component in glob.split("/") if component not in ("", ".")
     ]
+    if components and glob.endswith("/"):
+        components.append("")
+    return "/".join(components)
+
+
+def _translate_glob(glob: str) -> str:
+    """Translate a normalized path glob into a regular expression.
+
+    Unlike `fnmatch.translate`, `*`, `?` and character classes don't match the `/`
+    separator, and a `**` component matches zero or more directories, as `Path.glob`
+    does.
+    """
+    components = glob.split("/")
+    regex = []
+    for index, component in enumerate(components):
+        is_last = index == len(components) - 1
+        if component == "**":
+            regex.append(".*" if is_last else "(?:.*/)?")
+            continue
+        regex.append(_translate_glob_component(component))
+        if not is_last:
+            regex.append("/")
+    return "".join(regex)
+
+
+def _translate_glob_component(component: str) -> str:
+    regex = []
+    index = 0
+    while index < len(component):
+        char = component[index]
+        index += 1
+        if char == "*":
+            regex.append("[^/]*")
+        elif char == "?":
+            regex.append("[^/]")
+        elif char == "[":
+            # Find the end of the class like fnmatch does, a `]` right after `[` or
+            # `[!` is part of it, and an unterminated `[` is a literal
+            end = index
+            if end < len(component) and component[end] == "!":
+                end += 1
+            if end < len(component) and component[end] == "]":
+                end += 1
+            while end < len(component) and component[end] != "]":
+                end += 1
+            if end >= len(component):
+                regex.append("\\[")
+                continue
+            regex.append(_translate_glob_class(component[index:end]))
+            index = end + 1
+        else:
+            regex.append(re.escape(char))
+    return "".join(regex)
+
+
+def _translate_glob_class(chars: str) -> str:
+    """Translate the contents of a `[...]` glob character class, as fnmatch does.
+
+    Reversed ranges like `z-a` match nothing instead of being an invalid regex, and
+    the class never matches the `/` separator, even when negated with `!`.
+    """
+    negated = chars.startswith("!")
+    if negated:
+        chars = chars[1:]
+    # Split the ranges on their `-`, a `-` at the start or end of the class is a
+    # literal
+    chunks = []
+    start = 0
+    index = chars.find("-", 1)
+    while index >= 0:
+        chunks.append(chars[start:index])
+        start = index + 1
+        index = chars.find("-", index + 3)
+    if chars[start:] or not chunks:
+        chunks.append(chars[start:])
+    else:
+        chunks[-1] += "-"
+    for index in range(len(chunks) - 1, 0, -1):
+        if chunks[index - 1][-1] > chunks[index][0]:
+            chunks[index - 1] = chunks[index - 1][:-1] + chunks[index][1:]
+            del chunks[index]
+    regex_chars = "-".join(
+        chunk.replace("\\", "\\\\").replace("-", "\\-") for chunk in chunks
+    )
+    # Escape the set operations and the characters that are special at the start of
+    # a regex class
+    regex_chars = re.sub(r"([&~|])", r"\\\1", regex_chars)
+    if regex_chars.startswith(("^", "[")):
+        regex_chars = f"\\{regex_chars}"
+
+    if not regex_chars:
+        return "[^/]" if negated else "(?!)"
+    if negated:
+        return f"(?:(?!/)[^{regex_chars}])"
+    return f"(?:(?!/)[{regex_chars}])"
+
+
+def _is_static_glob(glob: str) -> bool:
+    return not any(char in glob for char in "*?[")
+
+
+def _compile_static_glob(glob: str) -> Optional[GlobMatcher]:
+    """Build a function that tells whether a relative posix path matches the glob.
+
+    Only the common literal, `prefix/**`, `**/suffix` and `*.ext` forms, which can be
+    matched with plain string comparisons, are supported. None is returned otherwise.
+    """
+    if _is_static_glob(glob):
+        return glob.__eq__
+    if glob.endswith("/**") and _is_static_glob(glob[:-3]):
+        prefix = glob[:-2]
+        return lambda path: path.startswith(prefix)
+
+    any_depth = glob.startswith("**/")
+    tail = glob[3:] if any_depth else glob
+    if any_depth and _is_static_glob(tail):
+        suffix = f"/{tail}"
+        return lambda path: path == tail or path.endswith(suffix)
+    if tail.startswith("*") and "/" not in tail and _is_static_glob(tail[1:]):
+        extension = tail[1:]
+        if any_depth:
+            return lambda path: path.endswith(extension)
+        return lambda path: path.endswith(extension) and "/" not in path
+
+    return None
+
+
+def _compile_globs(globs: Optional[List[str]]) -> List[GlobMatcher]:
+    normalized_globs = (_normalize_glob(glob) for glob in globs or [])
+    return _compile_glob_tuple(tuple(glob for glob in normalized_globs if glob))
+
+
+@lru_cache(maxsize=256)
+def _compile_glob_tuple(globs: Tuple[str, ...]) -> List[GlobMatcher]:
+    """Build the functions that tell whether a relative posix path matches the globs.
+
+    The globs that can't be matched with string comparisons are joined in a single
+    regular expression, so a path is tested against all of them with one match.
+    """
+    matchers = []
+    regexes = []
+    for glob in globs:
+        matcher = _compile_static_glob(glob)
+        if matcher:
+            matchers.append(matcher)
+        else:
+            regexes.append(f"(?:{_translate_glob(glob)})")
+    if regexes:
+        matchers.append(re.compile("|".join(regexes)).fullmatch)
+    return matchers
+
+
+def _matches_any_glob(relative_path: str, globs: List[GlobMatcher]) -> bool:
+    return any(matches(relative_path) for matches in globs)
+
+
+def _excluded_dir_names(globs: Optional[List[str]]) -> Set[str]:
+    """Extract the directory names excluded at any depth by `**/name(/**)` globs."""
+    names = set()
+    for glob in map(_normalize_glob, globs or []):
+        name = glob[3:-3] if glob.endswith("/**") else glob[3:]
+        if glob.startswith("**/") and "/" not in name and _is_static_glob(name):
+            names.add(name)
+    return names
+
+
+def _is_excluded_dir(relative_path: str, exclude_patterns: List[GlobMatcher]) -> bool:
+    # Try the path with a trailing slash too, so `dir/` and `dir/**` prune the directory
+    # itself instead of every entry in it
+    return any(
+        matches(relative_path) or matches(f"{relative_path}/")
+        for matches in exclude_patterns
+    )
 
 
+def _scan_yaml_files(
+    dir_: str,
+    relative_dir: str,
+    include_patterns: List[GlobMatcher],
+    exclude_patterns: List[GlobMatcher],
+    excluded_dir_names: Set[str],
+) -> Tuple[List[str], List[Tuple[str, str]]]:
+    """Scan a directory for yaml files and subdirectories to walk.
+
+    Paths are kept as strings, `relative_dir` is the posix path of `dir_` relative to
+    the walked root, with a trailing slash unless it's the root.
+
+    Returns:
+        The paths of the yaml files, and the paths of the subdirectories along with
+        their `relative_dir`.
+    """
+    yaml_files = []
+    subdirs = []
+    try:
+        entries = os.scandir(dir_)
+    except PermissionError:
+        # Skip unreadable directories, as Path.rglob does
+        return yaml_files, subdirs
+    with entries:
+        for entry in entries:
+            relative_path = relative_dir + entry.name
+            # Don't follow directory symlinks, as Path.rglob doesn't either
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in excluded_dir_names and not _is_excluded_dir(
+                    relative_path, exclude_patterns
+                ):
+                    subdirs.append((entry.path, f"{relative_path}/"))
+            elif (
+                entry.is_file()
+                and not _matches_any_glob(relative_path, exclude_patterns)
+                and _matches_any_glob(relative_path, include_patterns)
+            ):
+                yaml_files.append(entry.path)
+    return yaml_files, subdirs
+
+
+def _walk_yaml_files(
+    dir_: str,
+    relative_dir: str,
+    include_patterns: List[GlobMatcher],
+    exclude_patterns: List[GlobMatcher],
+    excluded_dir_names: Set[str],
+) -> List[str]:
+    """Find the paths of the yaml files under a directory, depth first.
+
+    Like `os.walk(topdown=True)` with in-place pruning, excluded directories are
+    dropped before descending, and a stack is used instead of recursion so that deep
+    trees don't reach the recursion limit.
+    """
+    patterns = (include_patterns, exclude_patterns, excluded_dir_names)
+    yaml_files: List[str] = []
+    pending_dirs = [(dir_, relative_dir)]
+    while pending_dirs:
+        found_files, subdirs = _scan_yaml_files(*pending_dirs.pop(), *patterns)
+        yaml_files.extend(found_files)
+        pending_dirs.extend(reversed(subdirs))
+    return yaml_files
+
+
+def _walk_yaml_files_in_parallel(
+    dir_: str,
+    include_patterns: List[GlobMatcher],
+    exclude_patterns: List[GlobMatcher],
+    excluded_dir_names: Set[str],
+) -> List[str]:
+    """Find the paths of the yaml files under a directory.
+
+    Each subdirectory of `dir_` is walked in a thread pool, as os.scandir releases the
+    GIL, so reads from slow or cold disks overlap.
+    """
+    patterns = (include_patterns, exclude_patterns, excluded_dir_names)
+    yaml_files, subdirs = _scan_yaml_files(dir_, "", *patterns)
+    if len(subdirs) < 2:
+        for subdir, relative_dir in subdirs:
+            yaml_files.extend(_walk_yaml_files(subdir, relative_dir, *patterns))
+        return yaml_files
+
+    with ThreadPoolExecutor(max_workers=WALK_WORKERS) as executor:
+        futures = [
+            executor.submit(_walk_yaml_files, subdir, relative_dir, *patterns)
+            for subdir, relative_dir in subdirs
+        ]
+        for future in futures:
+            yaml_files.extend(future.result())
+    return yaml_files
+
+
+def _find_all_yaml_files(
+    dir_: str, include_globs: Optional[List[str]], exclude_globs: Optional[List[str]]
+) -> List[str]:
+    # Include globs match at any depth, like Path.rglob does
+    include_patterns = _compile_globs(
+        [f"**/{glob}" for glob in map(_normalize_glob, include_globs or []) if glob]
+    )
+    exclude_patterns = _compile_globs(exclude_globs)
+    yaml_files = _walk_yaml_files_in_parallel(
+        dir_,
+        include_patterns,
+        exclude_patterns,
+        _excluded_dir_names(exclude_globs),
+    )
+    # Paths are returned as strings, building Path objects would take most of the walk
+    # time on big trees
+    return sorted(yaml_files)
+
+
+def _deduplicate_files(files: List[str]) -> List[str]:
+    """Remove the files that were found more than once, keeping their first position.
+
+    It happens when the same file, or a file and its directory, are passed more than
+    once.
+    """
+    unique_files: Dict[str, str] = {}
+    for file in files:
+        unique_files.setdefault(os.path.abspath(file), file)
+    return list(unique_files.values())
+
+
+def _check_files_access(files: List[str], check: bool) -> None:
+    """Fail if a file can't be read, or written unless it's only checked.
+
+    Files are opened lazily by fix_files, so this is done before any file is fixed.
+    """
+    for file in files:
+        if not os.access(file, os.R_OK):
+            raise ValueError(f"Cannot read file '{file}'.")
+        if not check and not os.access(file, os.W_OK):
+            raise ValueError(f"Cannot write file '{file}'.")
+
 
 @click.command()
 @click.version_option(version="", message=version.version_info())
@@ -92,20 +400,23 @@ def cli(  # pylint: disable=too-many-arguments
 
     Use - to read from stdin. No other files can be specified in this case.
     """
-    files_to_fix: List[TextIOWrapper] = []
+    # Files are passed as paths, so fix_files opens each one only while fixing it
+    files_to_fix: Union[List[TextIOWrapper], List[str]] = []
     if "-" in files:
         if len(files) > 1:
             raise ValueError("Cannot specify '-' and other files at the same time.")
         files_to_fix = [sys.stdin]
     else:
-        paths = [Path(file) for file in files]
         real_files = []
-        for provided_file in paths:
-            if provided_file.is_dir():
+        for provided_file in files:
+            if os.path.isdir(provided_file):
                 real_files.extend(_find_all_yaml_files(provided_file, include, exclude))
-            else:
+            elif os.path.isfile(provided_file):
                 real_files.append(provided_file)
-        files_to_fix = [file.open("r+") for file in real_files]
+            else:
+                raise ValueError(f"Cannot read file '{provided_file}'.")
+        files_to_fix = _deduplicate_files(real_files)
+        _check_files_access(files_to_fix, check)
     if not files_to_fix:
         log.warning("No YAML files found!")
         sys.exit(0)
@@ -113,14 +424,9 @@ def cli(  # pylint: disable=too-many-arguments
     load_logger(verbose)
     log.info("YamlFix: %s files", "Checking" if check else "Fixing")
 
-    config = YamlfixConfig()
-    configure_yamlfix(
-        config, config_file, _parse_env_vars_as_yamlfix_config(env_prefix.lower())
-    )
+    config = _load_config(config_file, env_prefix)
 
     fixed_code, changed = services.fix_files(files_to_fix, check, config)
-    for file_to_close in files_to_fix:
-        file_to_close.close()
 
     if fixed_code is not None:
         print(fixed_code, end="")
@@ -129,15 +435,25 @@ def cli(  # pylint: disable=too-many-arguments
         sys.exit(1)
 
 
+def _load_config(config_files: Optional[List[str]], env_prefix: str) -> YamlfixConfig:
+    config = YamlfixConfig()
+    configure_yamlfix(
+        config, config_files, _parse_env_vars_as_yamlfix_config(env_prefix.lower())
+    )
+    return config
+
+
 def _parse_env_vars_as_yamlfix_config(env_prefix: str) -> Dict[str, str]:
-    prefix_length = len(env_prefix) + 1  # prefix with underscore / delimiter (+1)
+    # The prefix is followed by an underscore / delimiter and at least one character
+    env_key_regex = re.compile(
+        rf"{re.escape(env_prefix)}.(.+)", re.IGNORECASE | re.DOTALL
+    )
     additional_config: Dict[str, str] = {}
 
     for env_key, env_val in os.environ.items():
-        sanitized_key = env_key.lower()
-
-        if sanitized_key.startswith(env_prefix) and len(sanitized_key) > prefix_length:
-            additional_config[sanitized_key[prefix_length:]] = env_val
+        match = env_key_regex.match(env_key)
+        if match:
+            additional_config[match.group(1).lower()] = env_val
 
     return additional_config
 
@@ -6,6 +6,7 @@ import re
 from itertools import product
 from pathlib import Path
 from textwrap import dedent
+from typing import Any, List
 
 import py  # type: ignore
 import pytest
@@ -129,6 +130,183 @@ def test_include_exclude_files(runner: CliRunner, tmp_path: Path) -> None:
     assert exclude4.read_text() == init_source
 
 
+def test_exclude_globs_are_relative_to_directory(
+    runner: CliRunner, tmp_path: Path
+) -> None:
+    """Exclude globs match paths relative to the directory, `*` not crossing `/`."""
+    (tmp_path / "foo").mkdir()
+    exclude = tmp_path / "source_1.yaml"
+    include = tmp_path / "foo" / "source_2.yaml"
+    init_source = "program: yamlfix"
+    for test_file in [exclude, include]:
+        test_file.write_text(init_source)
+
+    result = runner.invoke(cli, [str(tmp_path), "--exclude", "*.yaml"])
+
+    assert result.exit_code == 0
+    assert exclude.read_text() == init_source
+    assert include.read_text() == "---\nprogram: yamlfix\n"
+
+
+def test_exclude_directory(runner: CliRunner, tmp_path: Path) -> None:
+    """Files inside an excluded directory are ignored."""
+    (tmp_path / "foo" / "bar").mkdir(parents=True)
+    include = tmp_path / "source_1.yaml"
+    exclude1 = tmp_path / "foo" / "source_2.yaml"
+    exclude2 = tmp_path / "foo" / "bar" / "source_3.yaml"
+    init_source = "program: yamlfix"
+    for test_file in [include, exclude1, exclude2]:
+        test_file.write_text(init_source)
+
+    result = runner.invoke(cli, [str(tmp_path), "--exclude", "foo"])
+
+    assert result.exit_code == 0
+    assert include.read_text() == "---\nprogram: yamlfix\n"
+    assert exclude1.read_text() == init_source
+    assert exclude2.read_text() == init_source
+
+
+def test_skip_unreadable_directories(
+    runner: CliRunner, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Directories that can't be read are skipped instead of aborting the run."""
+    (tmp_path / "locked").mkdir()
+    (tmp_path / "ok").mkdir()
+    include = tmp_path / "ok" / "source_1.yaml"
+    locked = tmp_path / "locked" / "source_2.yaml"
+    init_source = "program: yamlfix"
+    for test_file in [include, locked]:
+        test_file.write_text(init_source)
+    scandir = os.scandir
+
+    def locked_scandir(path: str) -> Any:  # noqa: ANN401
+        if os.path.basename(path) == "locked":
+            raise PermissionError(13, "Permission denied", path)
+        return scandir(path)
+
+    monkeypatch.setattr(os, "scandir", locked_scandir)
+
+    result = runner.invoke(cli, [str(tmp_path)])
+
+    assert result.exit_code == 0
+    assert include.read_text() == "---\nprogram: yamlfix\n"
+    assert locked.read_text() == init_source
+
+
+def test_find_files_in_several_directories(
+    runner: CliRunner, tmp_path: Path, caplog: LogCaptureFixture
+) -> None:
+    """Files under several subdirectories are found, excluded and fixed in order."""
+    caplog.set_level(logging.INFO)
+    for directory in ["a/sub", "b", "c"]:
+        (tmp_path / directory).mkdir(parents=True)
+    test_files = [
+        tmp_path / "source_0.yaml",
+        tmp_path / "a" / "source_1.yaml",
+        tmp_path / "a" / "sub" / "source_2.yaml",
+        tmp_path / "b" / "source_3.yaml",
+    ]
+    exclude = tmp_path / "c" / "source_4.yaml"
+    init_source = "program: yamlfix"
+    for test_file in [*reversed(test_files), exclude]:
+        test_file.write_text(init_source)
+
+    result = runner.invoke(cli, [str(tmp_path), "--exclude", "c"])
+
+    assert result.exit_code == 0
+    for test_file in test_files:
+        assert test_file.read_text() == "---\nprogram: yamlfix\n"
+    assert exclude.read_text() == init_source
+    fixed_messages = [
+        message for _, _, message in caplog.record_tuples if message.startswith("Fixed")
+    ]
+    # Files are fixed in path order, whatever thread found them
+    assert fixed_messages == [
+        f"Fixed {test_file}" for test_file in sorted(map(str, test_files))
+    ]
+
+
+@pytest.mark.parametrize("exclude", ["foo/", "foo/**", "**/foo", "**/foo/**"])
+def test_exclude_directory_globs(
+    runner: CliRunner, tmp_path: Path, exclude: str
+) -> None:
+    """Directories matching a directory glob are ignored as a whole."""
+    (tmp_path / "foo" / "bar").mkdir(parents=True)
+    include = tmp_path / "source_1.yaml"
+    exclude1 = tmp_path / "foo" / "source_2.yaml"
+    exclude2 = tmp_path / "foo" / "bar" / "source_3.yaml"
+    init_source = "program: yamlfix"
+    for test_file in [include, exclude1, exclude2]:
+        test_file.write_text(init_source)
+
+    result = runner.invoke(cli, [str(tmp_path), "--exclude", exclude])
+
+    assert result.exit_code == 0
+    assert include.read_text() == "---\nprogram: yamlfix\n"
+    assert exclude1.read_text() == init_source
+    assert exclude2.read_text() == init_source
+
+
+@pytest.mark.parametrize(
+    ("exclude", "excluded_files"),
+    [
+        ("foo/**", ["foo/bar/source_2.yaml", "foo/source_3.yml"]),
+        ("**/source_2.yaml", ["foo/bar/source_2.yaml"]),
+        ("**/*.yml", ["foo/source_3.yml", "source_4.yml"]),
+        ("*.yml", ["source_4.yml"]),
+        ("./foo/*.yml", ["foo/source_3.yml"]),
+        ("foo//*.yml", ["foo/source_3.yml"]),
+        ("foo/[!].yaml", []),
+        ("foo[!x]source_3.yml", []),
+        ("[^s]ource_4.yml", ["source_4.yml"]),
+        ("[!s]ource_4.yml", []),
+        ("source_[1-3].yaml", ["source_1.yaml"]),
+        ("source_[4-1].yml", []),
+        ("source_[!-x].yml", ["source_4.yml"]),
+        ("**/source_[!1-2-].y*", ["foo/source_3.yml", "source_4.yml"]),
+        ("foo[!-x]source_3.yml", []),
+        ("foo[--0]source_3.yml", []),
+    ],
+)
+def test_exclude_static_globs(
+    runner: CliRunner, tmp_path: Path, exclude: str, excluded_files: List[str]
+) -> None:
+    """Globs with a static prefix or suffix exclude the same files a regex would."""
+    (tmp_path / "foo" / "bar").mkdir(parents=True)
+    test_files = [
+        tmp_path / "source_1.yaml",
+        tmp_path / "foo" / "bar" / "source_2.yaml",
+        tmp_path / "foo" / "source_3.yml",
+        tmp_path / "source_4.yml",
+    ]
+    init_source = "program: yamlfix"
+    for test_file in test_files:
+        test_file.write_text(init_source)
+
+    result = runner.invoke(cli, [str(tmp_path), "--exclude", exclude])
+
+    assert result.exit_code == 0
+    for test_file in test_files:
+        if test_file.relative_to(tmp_path).as_posix() in excluded_files:
+            assert test_file.read_text() == init_source
+        else:
+            assert test_file.read_text() == "---\nprogram: yamlfix\n"
+
+
+@pytest.mark.parametrize("option", ["--include", "--exclude"])
+def test_absolute_glob_error(runner: CliRunner, tmp_path: Path, option: str) -> None:
+    """Fail instead of reinterpreting absolute globs as relative ones."""
+    test_file = tmp_path / "source.yaml"
+    test_file.write_text("program: yamlfix")
+    glob = f"{tmp_path}/*.yaml"
+
+    result = runner.invoke(cli, [str(tmp_path), option, glob])
+
+    assert result.exit_code == 1
+    assert str(result.exception) == f"Non-relative glob '{glob}' is not supported."
+    assert test_file.read_text() == "program: yamlfix"
+
+
 @pytest.mark.secondary()
 @pytest.mark.parametrize(
     ("verbose", "requires_fixing"), product([0, 1, 2], [True, False])
@@ -386,6 +564,24 @@ def test_find_files(runner: CliRunner, tmp_path: Path) -> None:
         assert test_file.read_text() == fixed_source
 
 
+def test_fix_files_found_more_than_once(
+    runner: CliRunner, tmp_path: Path, caplog: LogCaptureFixture
+) -> None:
+    """Files passed both directly and through their directory are fixed once."""
+    test_file = tmp_path / "source.yaml"
+    test_file.write_text("program: yamlfix")
+
+    result = runner.invoke(cli, [str(test_file), str(tmp_path), str(tmp_path)])
+
+    assert result.exit_code == 0
+    assert test_file.read_text() == "---\nprogram: yamlfix\n"
+    assert (
+        "yamlfix.services",
+        logging.INFO,
+        "Checked 1 files: 1 fixed, 0 left unchanged, 0 failed",
+    ) in caplog.record_tuples
+
+
 def test_no_yaml_files(
     runner: CliRunner, tmp_path: Path, caplog: LogCaptureFixture
 ) -> None:
@@ -413,6 +609,55 @@ def test_std_and_file_error(runner: CliRunner, tmp_path: Path) -> None:
     )
 
 
+def test_missing_file_error(runner: CliRunner, tmp_path: Path) -> None:
+    """Fail before fixing any file if one of them can't be read."""
+    filepath = tmp_path / "test.yaml"
+    filepath.write_text("program: yamlfix")
+    missing_filepath = tmp_path / "missing.yaml"
+
+    result = runner.invoke(cli, [str(filepath), str(missing_filepath)])
+
+    assert result.exit_code == 1
+    assert str(result.exception) == f"Cannot read file '{missing_filepath}'."
+    assert filepath.read_text() == "program: yamlfix"
+
+
+@pytest.mark.parametrize(
+    ("denied_mode", "check", "error"),
+    [
+        (os.R_OK, True, "Cannot read file"),
+        (os.W_OK, False, "Cannot write file"),
+    ],
+)
+def test_inaccessible_found_file_error(
+    runner: CliRunner,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    denied_mode: int,
+    check: bool,
+    error: str,
+) -> None:
+    """Fail before fixing any file if a file found in a directory can't be fixed."""
+    test_files = [tmp_path / "source_1.yaml", tmp_path / "source_2.yaml"]
+    for test_file in test_files:
+        test_file.write_text("program: yamlfix")
+    denied_file = str(test_files[1])
+    access = os.access
+    # Permissions can't be denied with chmod when running the tests as root
+    monkeypatch.setattr(
+        os,
+        "access",
+        lambda path, mode: not (path == denied_file and mode == denied_mode)
+        and access(path, mode),
+    )
+
+    result = runner.invoke(cli, [str(tmp_path)] + (["--check"] if check else []))
+
+    assert result.exit_code == 1
+    assert str(result.exception) == f"{error} '{denied_file}'."
+    assert test_files[0].read_text() == "program: yamlfix"
+
+
 def test_do_not_read_folders_as_files(runner: CliRunner, tmpdir: py.path.local) -> None:
     """Skips folders that have a .yml or .yaml extension."""
     tmpdir.mkdir("folder.yml")
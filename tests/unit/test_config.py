@@ -0,0 +1,65 @@
+"""Tests the configuration of the program."""
+
+import os
+from pathlib import Path
+
+from yamlfix.config import configure_yamlfix
+from yamlfix.model import YamlfixConfig
+
+
+class TestConfigureYamlfix:
+    """Test the configure_yamlfix function."""
+
+    def test_configure_yamlfix_reads_edited_config_file(self, tmp_path: Path) -> None:
+        """
+        Given: A configuration file already used to configure yamlfix
+        When: The file is edited and yamlfix is configured again
+        Then: The new values are used
+        """
+        config_file = tmp_path / "yamlfix.toml"
+        config_file.write_text("line_length = 100")
+        stat = config_file.stat()
+        configure_yamlfix(YamlfixConfig(), [str(config_file)])
+        config_file.write_text("line_length = 1000")
+        # Edited within the same mtime tick
+        os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        config = YamlfixConfig()
+
+        configure_yamlfix(config, [str(config_file)])  # act
+
+        assert config.line_length == 1000
+
+    def test_configure_yamlfix_reads_same_size_edited_config_file(
+        self, tmp_path: Path
+    ) -> None:
+        """
+        Given: A configuration file already used to configure yamlfix
+        When: The file is edited keeping its size, and yamlfix is configured again
+        Then: The new values are used
+        """
+        config_file = tmp_path / "yamlfix.toml"
+        config_file.write_text("line_length = 100")
+        configure_yamlfix(YamlfixConfig(), [str(config_file)])
+        config_file.write_text("line_length = 120")
+        stat = config_file.stat()
+        os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        config = YamlfixConfig()
+
+        configure_yamlfix(config, [str(config_file)])  # act
+
+        assert config.line_length == 120
+
+    def test_configure_yamlfix_applies_additional_config(self, tmp_path: Path) -> None:
+        """
+        Given: A configuration file already used to configure yamlfix
+        When: Configuring yamlfix again with the same file and an override
+        Then: The override is used
+        """
+        config_file = tmp_path / "yamlfix.toml"
+        config_file.write_text("line_length = 100")
+        configure_yamlfix(YamlfixConfig(), [str(config_file)])
+        config = YamlfixConfig()
+
+        configure_yamlfix(config, [str(config_file)], {"line_length": "120"})  # act
+
+        assert config.line_length == 120
@@ -58,6 +58,21 @@ class TestFixFiles:
 
         assert test_file.read_text() == fixed_source
 
+    def test_fix_files_reads_read_only_formatted_files(self, tmp_path: Path) -> None:
+        """
+        Given: A read-only file that is already well formatted
+        When: Passing the string with the path to the file to fix_files
+        Then: The file is checked without opening it for writing
+        """
+        test_file = tmp_path / "source.yaml"
+        test_file.write_text("---\nprogram: yamlfix\n")
+        test_file.chmod(0o444)
+
+        result = fix_files([str(test_file)], False)
+
+        assert result == (None, False)
+        assert test_file.read_text() == "---\nprogram: yamlfix\n"
+
     def test_fix_files_issues_warning(self, tmp_path: Path) -> None:
         """
         Given: A file to fix